@@ -1,14 +1,17 @@
 from __future__ import annotations
 
 import argparse
+import sqlite3
 import sys
 import time
+from typing import Any, Optional, Tuple
 
 import paho.mqtt.client as mqtt
 
 from .config import build_config, load_yaml_config
-from .metrics import query_metrics
-from .mqtt import SENSORS, mqtt_publish, publish_discovery
+from .db import connect, db_file_id
+from .metrics import RowCache, query_metrics
+from .mqtt import SENSORS, encode_payload, mqtt_publish, publish_discovery
 from .secrets import load_env_file
 
 
@@ -54,6 +57,23 @@ def main(argv: list[str]) -> int:
     availability_topic = f"{cfg.base_topic}/{cfg.baby_id}/availability"
     client.will_set(availability_topic, "offline", retain=True)
 
+    # Built once and reused every cycle; discovery points HA at the same state_topic
+    last_error_topic = f"{cfg.base_topic}/{cfg.baby_id}/last_error"
+    state_topic = f"{cfg.base_topic}/{cfg.baby_id}/state"
+
+    # Last payload delivered per topic; states are retained, so unchanged values are not re-sent
+    last_state: dict[str, bytes] = {}
+
+    def on_connect(client: mqtt.Client, userdata: Any, flags: Any, reason_code: Any, properties: Any) -> None:
+        if reason_code.is_failure:
+            return
+        # Online: runs on the first connect and after every reconnect, replacing the retained LWT "offline"
+        mqtt_publish(client, availability_topic, "online", retain=True)
+        # paho drops its outgoing queue across reconnects; resend all states on the next cycle
+        last_state.clear()
+
+    client.on_connect = on_connect
+
     client.connect(cfg.mqtt.host, cfg.mqtt.port, keepalive=60)
     client.loop_start()
 
@@ -61,48 +81,85 @@ def main(argv: list[str]) -> int:
     publish_discovery(
         client,
         discovery_prefix=cfg.ha_discovery_prefix,
-        base_topic=cfg.base_topic,
+        state_topic=state_topic,
+        availability_topic=availability_topic,
         baby_id=cfg.baby_id,
         baby_name=cfg.baby_name,
-        baby_slug=cfg.baby_slug,
+        ha_object_id_prefix=f"sprout_track_{cfg.baby_slug}",
     )
 
-    # Online
-    mqtt_publish(client, availability_topic, "online", retain=True)
+    # Opened lazily and kept across poll cycles; dropped on errors or when the file is replaced
+    con: Optional[sqlite3.Connection] = None
+    con_file_id: Optional[Tuple[int, int]] = None
+    # Lives and dies with the connection: data_version is only meaningful per connection
+    row_cache = RowCache()
+
+    def close_db() -> None:
+        nonlocal con, con_file_id, row_cache
+        if con is not None:
+            con.close()
+        con = None
+        con_file_id = None
+        row_cache = RowCache()
+
+    def get_db() -> sqlite3.Connection:
+        nonlocal con, con_file_id
+        # Stat first: sqlite3.connect would silently create an empty DB at a missing path
+        file_id = db_file_id(cfg.db_path)
+        if con is not None and file_id != con_file_id:
+            close_db()
+        if con is None:
+            con = connect(cfg.db_path)
+            con_file_id = file_id
+        return con
+
+    def publish_changed(topic: str, payload: Any) -> None:
+        data = encode_payload(payload)
+        if last_state.get(topic) != data:
+            # QoS 0 publishes made while disconnected are dropped; only remember accepted ones
+            if mqtt_publish(client, topic, data, retain=True).rc == mqtt.MQTT_ERR_SUCCESS:
+                last_state[topic] = data
 
     def do_cycle() -> None:
-        metrics = query_metrics(cfg.db_path, cfg.baby_id, cfg.timezone).values
-
-        # Guardrail: only publish declared sensors
-        allowed = {s.key for s in SENSORS}
-        for k in list(metrics.keys()):
-            if k not in allowed:
-                metrics.pop(k, None)
-
-        for k, v in metrics.items():
-            mqtt_publish(
-                client,
-                f"{cfg.base_topic}/{cfg.baby_id}/sensor/{k}/state",
-                "" if v is None else v,
-                retain=True,
-            )
-
-        mqtt_publish(client, f"{cfg.base_topic}/{cfg.baby_id}/last_error", "", retain=True)
+        try:
+            metrics = query_metrics(get_db(), cfg.baby_id, cfg.timezone, row_cache).values
+        except sqlite3.Error:
+            # Reconnect on the next cycle; the error itself still goes to last_error
+            close_db()
+            raise
+
+        # One retained JSON document for all sensors; discovery extracts fields via value_template.
+        # Guardrail: only declared sensors, in a fixed order so unchanged states encode identically.
+        state: dict[str, Any] = {}
+        for s in SENSORS:
+            v = metrics.get(s.key)
+            state[s.key] = "" if v is None else v
+        publish_changed(state_topic, state)
+
+        publish_changed(last_error_topic, "")
 
     if args.once:
         try:
             do_cycle()
         except Exception as e:
-            mqtt_publish(client, f"{cfg.base_topic}/{cfg.baby_id}/last_error", str(e), retain=True)
+            publish_changed(last_error_topic, str(e))
             return 2
         return 0
 
+    # Schedule on a monotonic clock so cycle time doesn't accumulate as drift
+    next_tick = time.monotonic()
     while True:
+        next_tick += cfg.poll_sec
         try:
             do_cycle()
         except Exception as e:
-            mqtt_publish(client, f"{cfg.base_topic}/{cfg.baby_id}/last_error", str(e), retain=True)
-        time.sleep(cfg.poll_sec)
+            publish_changed(last_error_topic, str(e))
+        dt = next_tick - time.monotonic()
+        if dt > 0:
+            time.sleep(dt)
+        else:
+            # Overran the interval: restart the schedule rather than bursting to catch up
+            next_tick = time.monotonic()
 
 
 if __name__ == "__main__":
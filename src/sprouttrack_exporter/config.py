@@ -1,11 +1,23 @@
 from __future__ import annotations
 
+import json
+import os
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Optional
 
 import yaml
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:  # optional speedup for reading the config cache
+    _json_loads = json.loads
+
+# Prefer the libyaml-backed loader when PyYAML was built with it.
+Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 @dataclass(frozen=True)
 class MqttConfig:
@@ -37,14 +49,64 @@ def _require(d: Dict[str, Any], key: str) -> Any:
     return d[key]
 
 
+def _cache_path(p: Path) -> Path:
+    return p.with_name(p.name + ".cache.json")
+
+
+def _read_cache(cache: Path, mtime_ns: int) -> Optional[Dict[str, Any]]:
+    """Return the cached config if its header matches the YAML mtime, else None."""
+    try:
+        raw = cache.read_bytes()
+        header, _, body = raw.partition(b"\n")
+        if header.strip() != f"# mtime: {mtime_ns}".encode("ascii"):
+            return None
+        data = _json_loads(body)
+    except (OSError, ValueError):
+        # orjson.JSONDecodeError subclasses ValueError as well
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _write_cache(cache: Path, mtime_ns: int, data: Dict[str, Any]) -> None:
+    """Best-effort atomic write; a read-only config dir just means no cache."""
+    try:
+        body = json.dumps(data, ensure_ascii=False)
+    except (TypeError, ValueError):
+        # YAML produced something JSON can't represent (e.g. dates)
+        return
+    # JSON silently stringifies non-str keys; only cache what round-trips unchanged
+    if json.loads(body) != data:
+        return
+
+    tmp = cache.with_name(cache.name + ".tmp")
+    try:
+        with tmp.open("w", encoding="utf-8") as f:
+            f.write(f"# mtime: {mtime_ns}\n")
+            f.write(body)
+        os.replace(tmp, cache)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
 def load_yaml_config(path: str) -> Dict[str, Any]:
     p = Path(path)
     if not p.exists():
         raise FileNotFoundError(f"Config file not found: {path}")
+
+    mtime_ns = p.stat().st_mtime_ns
+    cache = _cache_path(p)
+    cached = _read_cache(cache, mtime_ns)
+    if cached is not None:
+        return cached
+
     with p.open("r", encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
+        data = yaml.load(f, Loader=Loader) or {}
     if not isinstance(data, dict):
         raise ValueError("Config YAML must be a mapping/dict")
+    _write_cache(cache, mtime_ns, data)
     return data
 
 
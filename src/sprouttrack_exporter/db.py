@@ -1,15 +1,61 @@
 from __future__ import annotations
 
+import os
 import sqlite3
-from typing import Optional, Sequence, Tuple
+from typing import Any, Optional, Sequence, Tuple
+
+# Partial indexes matching the exporter's hot predicates (babyId + live rows, newest first).
+INDEXES: Tuple[str, ...] = (
+    "CREATE INDEX IF NOT EXISTS idx_feedlog_baby_time ON FeedLog(babyId, time DESC) WHERE deletedAt IS NULL;",
+    "CREATE INDEX IF NOT EXISTS idx_feedlog_baby_type_time ON FeedLog(babyId, type, time) WHERE deletedAt IS NULL;",
+    "CREATE INDEX IF NOT EXISTS idx_diaperlog_baby_time ON DiaperLog(babyId, time DESC) WHERE deletedAt IS NULL;",
+    "CREATE INDEX IF NOT EXISTS idx_sleeplog_baby_start ON SleepLog(babyId, startTime DESC) WHERE deletedAt IS NULL;",
+)
+
+# Per-connection tuning. journal_mode is deliberately left to the app that owns the DB:
+# forcing WAL would leave a -wal file behind when the DB is replaced under an open
+# connection, and the next connection would replay it onto the new file.
+PRAGMAS: Tuple[str, ...] = (
+    "PRAGMA synchronous=NORMAL;",
+    "PRAGMA mmap_size=268435456;",
+    "PRAGMA cache_size=-20000;",
+    "PRAGMA temp_store=MEMORY;",
+)
+
+def ensure_indexes(con: sqlite3.Connection) -> None:
+    """Best-effort: a read-only or locked DB just keeps the existing query plans."""
+    try:
+        for sql in INDEXES:
+            con.execute(sql)
+        con.commit()
+    except sqlite3.Error:
+        con.rollback()
 
 
 def connect(db_path: str) -> sqlite3.Connection:
     con = sqlite3.connect(db_path)
-    con.row_factory = sqlite3.Row
+    for sql in PRAGMAS:
+        try:
+            con.execute(sql)
+        except sqlite3.Error:
+            # e.g. a busy DB; keep going with defaults
+            pass
+    # On every connect: cheap with IF NOT EXISTS, and covers a DB file replaced on disk
+    # as well as one that was locked or had no tables yet last time.
+    ensure_indexes(con)
+    try:
+        con.execute("PRAGMA optimize;")
+    except sqlite3.Error:
+        pass
     return con
 
 
-def query_one(cur: sqlite3.Cursor, sql: str, args: Sequence = ()) -> Optional[sqlite3.Row]:
+def db_file_id(db_path: str) -> Tuple[int, int]:
+    """(st_dev, st_ino) of the DB file; changes when the file is replaced on disk."""
+    st = os.stat(db_path)
+    return st.st_dev, st.st_ino
+
+
+def query_one(cur: sqlite3.Cursor, sql: str, args: Sequence = ()) -> Optional[Tuple[Any, ...]]:
     cur.execute(sql, args)
     return cur.fetchone()
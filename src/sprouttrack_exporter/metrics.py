@@ -1,32 +1,108 @@
 from __future__ import annotations
 
+import sqlite3
+import time
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone, tzinfo
 from zoneinfo import ZoneInfo
 
-from .db import connect, query_one
+from .db import query_one
+
+
+# All scalar metrics in one round-trip (?1 = babyId, ?2 = start of day ms).
+# Scalar subqueries yield NULL when a table has no matching rows; the latest
+# sleep is LEFT JOINed for the same reason.
+SQL_METRICS = """
+    WITH ls AS (
+        SELECT 1 AS found, startTime, endTime, type
+        FROM SleepLog
+        WHERE babyId=?1 AND deletedAt IS NULL
+        ORDER BY startTime DESC
+        LIMIT 1
+    )
+    SELECT
+        (SELECT time FROM FeedLog
+         WHERE babyId=?1 AND deletedAt IS NULL
+         ORDER BY time DESC LIMIT 1) AS last_feed,
+        (SELECT time FROM FeedLog
+         WHERE babyId=?1 AND deletedAt IS NULL AND type='BREAST'
+         ORDER BY time DESC LIMIT 1) AS last_breast,
+        (SELECT time FROM DiaperLog
+         WHERE babyId=?1 AND deletedAt IS NULL
+         ORDER BY time DESC LIMIT 1) AS last_diaper,
+        ls.found AS sleep_found,
+        ls.startTime AS sleep_start,
+        ls.endTime AS sleep_end,
+        ls.type AS sleep_type,
+        (SELECT COUNT(*) FROM FeedLog
+         WHERE babyId=?1 AND deletedAt IS NULL AND time >= ?2) AS feeds_today,
+        (SELECT COUNT(*) FROM DiaperLog
+         WHERE babyId=?1 AND deletedAt IS NULL AND time >= ?2) AS diapers_today,
+        (SELECT COALESCE(SUM(duration), 0) FROM SleepLog
+         WHERE babyId=?1 AND deletedAt IS NULL AND startTime >= ?2
+           AND duration IS NOT NULL) AS sleep_minutes
+    FROM (SELECT 1) LEFT JOIN ls;
+"""
+
+SQL_BREAST_SIDES = """
+    SELECT side
+    FROM FeedLog
+    WHERE babyId=? AND deletedAt IS NULL AND type='BREAST' AND time=?;
+"""
+
+
+# Two-digit strings "00".."99" for HH:MM formatting without format-spec parsing
+_TT = [f"{i:02d}" for i in range(100)]
+
+
+def format_hhmm(total_minutes: int) -> str:
+    hours, minutes = divmod(total_minutes, 60)
+    if 0 <= hours < 100:
+        return _TT[hours] + ":" + _TT[minutes]
+    # Out of table range, incl. negative totals from bad sleep durations: keep the visible "-1:55"
+    return f"{hours:02d}:{minutes:02d}"
 
 
 def now_ms() -> int:
-    return int(datetime.now(tz=timezone.utc).timestamp() * 1000)
+    return time.time_ns() // 1_000_000
 
 
-def hhmm_since_ms(ms: int | None) -> str:
-    """Convert (now - ms) to HH:MM. Returns 00:00 for None or negative."""
+def hhmm_since_ms(ms: int | None, now_ms_val: int) -> str:
+    """Convert (now_ms_val - ms) to HH:MM. Returns 00:00 for None or negative."""
     if ms is None:
         return "00:00"
-    delta_min = int((now_ms() - int(ms)) // 60000)
+    delta_min = int((now_ms_val - int(ms)) // 60000)
     if delta_min <= 0:
         return "00:00"
-    hours = delta_min // 60
-    minutes = delta_min % 60
-    return f"{hours:02d}:{minutes:02d}"
+    return format_hhmm(delta_min)
 
 
-def start_of_day_ms(tz_name: str) -> int:
-    tz = timezone.utc if tz_name.upper() == "UTC" else ZoneInfo(tz_name)
-    dt = datetime.now(tz=tz).replace(hour=0, minute=0, second=0, microsecond=0)
-    return int(dt.timestamp() * 1000)
+_TZ_CACHE: dict[str, tzinfo] = {}
+# tz_name -> (start of current local day ms, start of next local day ms)
+_SOD_CACHE: dict[str, tuple[int, int]] = {}
+
+
+def _get_tz(tz_name: str) -> tzinfo:
+    tz = _TZ_CACHE.get(tz_name)
+    if tz is None:
+        tz = timezone.utc if tz_name.upper() == "UTC" else ZoneInfo(tz_name)
+        _TZ_CACHE[tz_name] = tz
+    return tz
+
+
+def start_of_day_ms(tz_name: str, now_ms_val: int) -> int:
+    """Local midnight in ms; recomputed only once now crosses the next midnight."""
+    cached = _SOD_CACHE.get(tz_name)
+    if cached is not None and cached[0] <= now_ms_val < cached[1]:
+        return cached[0]
+
+    tz = _get_tz(tz_name)
+    today = datetime.fromtimestamp(now_ms_val / 1000, tz=tz).date()
+    tomorrow = today + timedelta(days=1)
+    sod_ms = int(datetime(today.year, today.month, today.day, tzinfo=tz).timestamp() * 1000)
+    next_sod_ms = int(datetime(tomorrow.year, tomorrow.month, tomorrow.day, tzinfo=tz).timestamp() * 1000)
+    _SOD_CACHE[tz_name] = (sod_ms, next_sod_ms)
+    return sod_ms
 
 
 @dataclass(frozen=True)
@@ -34,153 +110,123 @@ class MetricsResult:
     values: dict
 
 
-def query_metrics(db_path: str, baby_id: str, tz_name: str) -> MetricsResult:
-    con = connect(db_path)
+def _last_breast_side(cur: sqlite3.Cursor, baby_id: str, last_breast_time_ms: int) -> str | None:
+    """LEFT/RIGHT/BOTH for the latest BREAST session (rows grouped by identical time)."""
+    cur.execute(SQL_BREAST_SIDES, (baby_id, last_breast_time_ms))
+
+    has_left = has_right = False
+    for (side,) in cur:
+        if side is None:
+            continue
+        side = side.strip().upper()
+        if side == "LEFT":
+            has_left = True
+        elif side == "RIGHT":
+            has_right = True
+        if has_left and has_right:
+            break
+
+    if has_left and has_right:
+        return "BOTH"
+    if has_left:
+        return "LEFT"
+    if has_right:
+        return "RIGHT"
+    return None
+
+
+@dataclass
+class RowCache:
+    """DB-derived values from the last full query, owned by the caller next to its connection.
+
+    PRAGMA data_version only changes when another connection commits, so an unchanged
+    version on the same local day means these values can be reused as-is. The caller
+    must start a fresh RowCache whenever it replaces the connection.
+    """
+
+    baby_id: str | None = None
+    data_version: int | None = None
+    sod_ms: int | None = None
+    row: tuple | None = None
+    last_feed_side: str | None = None
+
+
+def query_metrics(
+    con: sqlite3.Connection, baby_id: str, tz_name: str, cache: RowCache | None = None
+) -> MetricsResult:
     cur = con.cursor()
 
-    # Last feed time (any feed type)
-    r = query_one(
-        cur,
-        """
-        SELECT time
-        FROM FeedLog
-        WHERE babyId=? AND deletedAt IS NULL
-        ORDER BY time DESC
-        LIMIT 1;
-        """,
-        (baby_id,),
-    )
-    last_feed_ms = int(r["time"]) if r and r["time"] is not None else None
-
-    # Breast feed side (LEFT/RIGHT/BOTH) for latest BREAST session (group by identical time)
-    r = query_one(
-        cur,
-        """
-        SELECT time
-        FROM FeedLog
-        WHERE babyId=? AND deletedAt IS NULL AND type='BREAST'
-        ORDER BY time DESC
-        LIMIT 1;
-        """,
-        (baby_id,),
-    )
-    last_breast_time_ms = int(r["time"]) if r and r["time"] is not None else None
+    now = now_ms()
+    sod_ms = start_of_day_ms(tz_name, now)
 
-    last_feed_side = None
-    next_feed_side = None
-    if last_breast_time_ms is not None:
-        cur.execute(
-            """
-            SELECT side
-            FROM FeedLog
-            WHERE babyId=? AND deletedAt IS NULL AND type='BREAST' AND time=?;
-            """,
-            (baby_id, last_breast_time_ms),
-        )
-
-        sides = sorted(
-            {
-                (row["side"] or "").strip().upper()
-                for row in cur.fetchall()
-                if row["side"] is not None
-            }
-        )
-
-        if "LEFT" in sides and "RIGHT" in sides:
-            last_feed_side = "BOTH"
-        elif "LEFT" in sides:
-            last_feed_side = "LEFT"
-        elif "RIGHT" in sides:
-            last_feed_side = "RIGHT"
-
-        # Rule: BOTH -> LEFT for next
-        if last_feed_side == "LEFT":
-            next_feed_side = "RIGHT"
-        elif last_feed_side == "RIGHT":
-            next_feed_side = "LEFT"
-        elif last_feed_side == "BOTH":
-            next_feed_side = "LEFT"
-
-    # Last diaper
-    r = query_one(
-        cur,
-        """
-        SELECT time
-        FROM DiaperLog
-        WHERE babyId=? AND deletedAt IS NULL
-        ORDER BY time DESC
-        LIMIT 1;
-        """,
-        (baby_id,),
+    (data_version,) = query_one(cur, "PRAGMA data_version;")
+    hit = (
+        cache is not None
+        and cache.row is not None
+        and cache.baby_id == baby_id
+        and cache.data_version == data_version
+        and cache.sod_ms == sod_ms
     )
-    last_diaper_ms = int(r["time"]) if r and r["time"] is not None else None
+    row = cache.row if hit else query_one(cur, SQL_METRICS, (baby_id, sod_ms))
+
+    (
+        last_feed,
+        last_breast,
+        last_diaper,
+        sleep_found,
+        sleep_start,
+        sleep_end,
+        sleep_type,
+        feeds_n,
+        diapers_n,
+        sleep_minutes,
+    ) = row
+
+    if hit:
+        last_feed_side = cache.last_feed_side
+    else:
+        last_feed_side = _last_breast_side(cur, baby_id, int(last_breast)) if last_breast is not None else None
+        if cache is not None:
+            cache.baby_id = baby_id
+            cache.data_version = data_version
+            cache.sod_ms = sod_ms
+            cache.row = row
+            cache.last_feed_side = last_feed_side
+
+    last_feed_ms = int(last_feed) if last_feed is not None else None
+    last_diaper_ms = int(last_diaper) if last_diaper is not None else None
+
+    # Rule: BOTH -> LEFT for next
+    next_feed_side = None
+    if last_feed_side == "LEFT":
+        next_feed_side = "RIGHT"
+    elif last_feed_side == "RIGHT":
+        next_feed_side = "LEFT"
+    elif last_feed_side == "BOTH":
+        next_feed_side = "LEFT"
 
     # Last sleep log
-    r = query_one(
-        cur,
-        """
-        SELECT startTime, endTime, type
-        FROM SleepLog
-        WHERE babyId=? AND deletedAt IS NULL
-        ORDER BY startTime DESC
-        LIMIT 1;
-        """,
-        (baby_id,),
-    )
-
-    last_sleep_start_ms = int(r["startTime"]) if r and r["startTime"] is not None else None
-    last_sleep_end_ms = int(r["endTime"]) if r and r["endTime"] is not None else None
-    last_sleep_type = (r["type"] if r else None)
+    last_sleep_start_ms = int(sleep_start) if sleep_start is not None else None
+    last_sleep_end_ms = int(sleep_end) if sleep_end is not None else None
+    last_sleep_type = sleep_type
 
-    if r and r["endTime"] is None:
+    if sleep_found and sleep_end is None:
         sleep_state = last_sleep_type or "SLEEPING"
         sleeping = "on"
     else:
         sleep_state = "AWAKE"
         sleeping = "off"
 
-    sod_ms = start_of_day_ms(tz_name)
-
-    r = query_one(
-        cur,
-        """
-        SELECT COUNT(*) AS n
-        FROM FeedLog
-        WHERE babyId=? AND deletedAt IS NULL AND time >= ?;
-        """,
-        (baby_id, sod_ms),
-    )
-    feeds_today = int(r["n"]) if r else 0
-
-    r = query_one(
-        cur,
-        """
-        SELECT COUNT(*) AS n
-        FROM DiaperLog
-        WHERE babyId=? AND deletedAt IS NULL AND time >= ?;
-        """,
-        (baby_id, sod_ms),
-    )
-    diapers_today = int(r["n"]) if r else 0
-
-    cur.execute(
-        """
-        SELECT duration
-        FROM SleepLog
-        WHERE babyId=? AND deletedAt IS NULL AND startTime >= ?;
-        """,
-        (baby_id, sod_ms),
-    )
-    sleep_minutes_today = sum(int(row["duration"]) for row in cur.fetchall() if row["duration"] is not None)
-    sleep_today = f"{sleep_minutes_today // 60:02d}:{sleep_minutes_today % 60:02d}"
-
-    con.close()
+    feeds_today = int(feeds_n)
+    diapers_today = int(diapers_n)
+    sleep_minutes_today = int(sleep_minutes)
+    sleep_today = format_hhmm(sleep_minutes_today)
 
     # Elapsed strings
-    time_since_feed = hhmm_since_ms(last_feed_ms)
-    time_since_diaper = hhmm_since_ms(last_diaper_ms)
-    time_since_sleep_start = hhmm_since_ms(last_sleep_start_ms) if sleeping == "on" else "00:00"
-    time_since_sleep_end = hhmm_since_ms(last_sleep_end_ms) if last_sleep_end_ms is not None else "00:00"
+    time_since_feed = hhmm_since_ms(last_feed_ms, now)
+    time_since_diaper = hhmm_since_ms(last_diaper_ms, now)
+    time_since_sleep_start = hhmm_since_ms(last_sleep_start_ms, now) if sleeping == "on" else "00:00"
+    time_since_sleep_end = hhmm_since_ms(last_sleep_end_ms, now) if last_sleep_end_ms is not None else "00:00"
 
     return MetricsResult(
         values={
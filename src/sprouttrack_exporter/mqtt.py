@@ -2,7 +2,8 @@ from __future__ import annotations
 
 import json
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
 
 import paho.mqtt.client as mqtt
 
@@ -32,10 +33,28 @@ SENSORS: list[SensorDef] = [
 ]
 
 
-def mqtt_publish(client: mqtt.Client, topic: str, payload: Any, retain: bool = True) -> None:
+def encode_payload(payload: Any) -> bytes:
+    """
+    Encode a payload to the bytes paho would send; bytes pass through untouched.
+    dict/list are sent as JSON. None is an empty payload (clears a retained topic).
+    """
+    if isinstance(payload, bytes):
+        return payload
+    if isinstance(payload, bytearray):
+        return bytes(payload)
+    if payload is None:
+        return b""
+    if isinstance(payload, str):
+        return payload.encode("utf-8")
+    if isinstance(payload, (int, float)):
+        return str(payload).encode("ascii")
     if isinstance(payload, (dict, list)):
-        payload = json.dumps(payload, ensure_ascii=False)
-    client.publish(topic, payload, qos=0, retain=retain)
+        return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    raise TypeError(f"Unsupported MQTT payload type: {type(payload).__name__}")
+
+
+def mqtt_publish(client: mqtt.Client, topic: str, payload: Any, retain: bool = True) -> mqtt.MQTTMessageInfo:
+    return client.publish(topic, encode_payload(payload), qos=0, retain=retain)
 
 
 def build_device() -> Dict[str, Any]:
@@ -51,24 +70,27 @@ def build_device() -> Dict[str, Any]:
     }
 
 
-def publish_discovery(
-    client: mqtt.Client,
+@lru_cache(maxsize=8)
+def build_discovery_payloads(
     *,
     discovery_prefix: str,
-    base_topic: str,
+    state_topic: str,
+    availability_topic: str,
     baby_id: str,
     baby_name: str,
     ha_object_id_prefix: str,
-) -> None:
+) -> Tuple[Tuple[str, bytes], ...]:
+    """
+    Serialized (config_topic, payload) pairs; cached since discovery never changes at runtime.
+    All sensors read their field from the one JSON document published to state_topic.
+    """
     device = build_device()
-    availability_topic = f"{base_topic}/{baby_id}/availability"
 
+    out = []
     for s in SENSORS:
         # Discovery topic format: homeassistant/<component>/<node_id>/<object_id>/config
         # We use a stable node_id ("sprouttrack") and stable unique_id per baby+metric.
         cfg_topic = f"{discovery_prefix}/sensor/sprouttrack/{baby_id}_{s.key}/config"
-        state_topic = f"{base_topic}/{baby_id}/sensor/{s.key}/state"
-
         cfg: Dict[str, Any] = {
             # Friendly name (what you see in HA UI)
             "name": f"{baby_name} {s.name_suffix}",
@@ -78,6 +100,7 @@ def publish_discovery(
             # Example: sprout_track_arthur_diapers_today
             "object_id": f"{ha_object_id_prefix}_{s.key}",
             "state_topic": state_topic,
+            "value_template": f"{{{{ value_json.{s.key} }}}}",
             "availability_topic": availability_topic,
             "device": device,
         }
@@ -89,5 +112,28 @@ def publish_discovery(
         if s.unit:
             cfg["unit_of_measurement"] = s.unit
 
+        out.append((cfg_topic, json.dumps(cfg, ensure_ascii=False).encode("utf-8")))
+    return tuple(out)
+
+
+def publish_discovery(
+    client: mqtt.Client,
+    *,
+    discovery_prefix: str,
+    state_topic: str,
+    availability_topic: str,
+    baby_id: str,
+    baby_name: str,
+    ha_object_id_prefix: str,
+) -> None:
+    payloads = build_discovery_payloads(
+        discovery_prefix=discovery_prefix,
+        state_topic=state_topic,
+        availability_topic=availability_topic,
+        baby_id=baby_id,
+        baby_name=baby_name,
+        ha_object_id_prefix=ha_object_id_prefix,
+    )
+    for cfg_topic, payload in payloads:
         # Discovery configs must be retained
-        mqtt_publish(client, cfg_topic, cfg, retain=True)
+        client.publish(cfg_topic, payload, qos=0, retain=True)
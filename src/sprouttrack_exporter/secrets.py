@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict
 
@@ -9,14 +10,19 @@ def load_env_file(path: str) -> Dict[str, str]:
     p = Path(path)
     if not p.exists():
         raise FileNotFoundError(f"Secrets file not found: {path}")
+    # Cached per (path, mtime); hand out a copy so callers can't mutate the cache
+    return dict(_load(str(p), p.stat().st_mtime_ns))
 
+
+@lru_cache(maxsize=8)
+def _load(path: str, mtime_ns: int) -> Dict[str, str]:
     out: Dict[str, str] = {}
-    for raw in p.read_text(encoding="utf-8").splitlines():
+    for raw in Path(path).read_text(encoding="utf-8").splitlines():
         line = raw.strip()
         if not line or line.startswith("#"):
             continue
-        if "=" not in line:
+        k, sep, v = line.partition("=")
+        if not sep:
             continue
-        k, v = line.split("=", 1)
         out[k.strip()] = v.strip()
     return out